@@ -1,35 +1,29 @@
 // backend/src/controllers/taskController.js
-const { spawn } = require('child_process');
+const { solve } = require('../solver/solverClient');
 const db = require('../config/db');
 
-// Fungsi pembantu untuk menjalankan solver
-const runSolverAndSave = (res, allTasks, userId) => {
-    const python = spawn('python', ['src/solver/solver.py']);
-    let dataToSend = '';
-    let errorData = '';
-
-    python.stdin.write(JSON.stringify(allTasks));
-    python.stdin.end();
-
-    python.stdout.on('data', (data) => {
-        dataToSend += data.toString();
-    });
+// Batas waktu solver (detik); setelah itu jadwal terbaik yang sudah ditemukan dipakai
+const SOLVER_TIME_LIMIT = 5;
 
-    python.stderr.on('data', (data) => {
-        errorData += data.toString();
-    });
-
-    python.on('close', (code) => {
-        if (code !== 0) {
-            console.error(`Python script exited with code ${code}: ${errorData}`);
-            return res.status(500).send('Error during scheduling.');
-        }
+// Rolling horizon (jam): tugas yang window-nya terbuka lebih jauh dari ini dijadwalkan per jam
+// dan posisinya dipertahankan sampai masuk horizon
+const SOLVER_HORIZON_HOURS = 7 * 24;
 
-        try {
-            const solvedSchedule = JSON.parse(dataToSend);
-
-            // Perbarui data tugas di database
-            const updates = solvedSchedule.map(task => {
+// Fungsi pembantu untuk menjalankan solver
+// changedIds: tugas yang berubah, supaya solver hanya mengoptimasi ulang tugas di sekitarnya
+const runSolverAndSave = (res, allTasks, userId, changedIds = []) => {
+    // num_workers sengaja tidak diisi: daemon membagi core di antara request yang berjalan bersamaan
+    const options = {
+        incremental: true,
+        changed_ids: changedIds,
+        time_limit: SOLVER_TIME_LIMIT,
+        horizon_hours: SOLVER_HORIZON_HOURS,
+        diff: true,
+    };
+    solve(allTasks, options).then(
+        ({ result: solvedSchedule, changed: changedTasks }) => {
+            // Hanya tugas yang penugasannya berubah yang perlu ditulis ke database
+            const updates = changedTasks.map(task => {
                 const { id, start_time, end_time, conflict, conflict_reason, status } = task;
                 return new Promise((resolve, reject) => {
                     const sql = `UPDATE tasks SET start_time = ?, end_time = ?, conflict = ?, conflict_reason = ?, status = ? WHERE id = ? AND user_id = ?`;
@@ -40,7 +34,7 @@ const runSolverAndSave = (res, allTasks, userId) => {
                 });
             });
 
-            Promise.all(updates)
+            return Promise.all(updates)
                 .then(() => {
                     res.json({ schedule: solvedSchedule });
                 })
@@ -48,12 +42,12 @@ const runSolverAndSave = (res, allTasks, userId) => {
                     console.error('Failed to update tasks in DB:', e);
                     res.status(500).send('Failed to save schedule to database.');
                 });
-
-        } catch (e) {
-            console.error('Failed to parse JSON from Python script:', e, 'Data:', dataToSend);
-            res.status(500).send('Invalid response from solver.');
+        },
+        e => {
+            console.error('Solver failed:', e);
+            res.status(500).send('Error during scheduling.');
         }
-    });
+    );
 };
 
 exports.addTask = (req, res) => {
@@ -97,7 +91,7 @@ exports.editTask = (req, res) => {
                 console.error(err);
                 return res.status(500).send('Failed to fetch tasks.');
             }
-            runSolverAndSave(res, allTasks, userId);
+            runSolverAndSave(res, allTasks, userId, [Number(id)]);
         });
     });
 };
@@ -122,7 +116,7 @@ exports.updateTaskStatus = (req, res) => {
                 console.error(err);
                 return res.status(500).send('Failed to fetch tasks.');
             }
-            runSolverAndSave(res, allTasks, userId);
+            runSolverAndSave(res, allTasks, userId, [Number(id)]);
         });
     });
 };
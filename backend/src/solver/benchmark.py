@@ -0,0 +1,205 @@
+# backend/src/solver/benchmark.py
+#
+# Benchmark solver.py dengan beban sintetis yang bisa diulang (seeded).
+#
+# Setiap kasus dijalankan sebagai proses solver.py tersendiri dengan
+# --instrument, sehingga waktu per fase, status solver dan puncak memori
+# diukur persis seperti di produksi. Hasilnya ditulis sebagai JSON supaya
+# bisa dibandingkan antar commit.
+#
+# Pemakaian:
+#   python src/solver/benchmark.py --output bench.json
+#   python src/solver/benchmark.py --sizes 10 200 --densities high --compare bench.json
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import itertools
+import subprocess
+from datetime import datetime, timedelta
+
+SOLVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'solver.py')
+
+SIZES = (10, 50, 200, 1000, 5000)
+
+# Bagian jam kerja harian yang terisi tugas; menentukan berapa hari beban disebar
+DENSITIES = {'low': 0.25, 'medium': 0.6, 'high': 0.95}
+
+# Bobot pemilihan prioritas '1', '2', '3'
+PRIORITY_MIXES = {'uniform': (1, 1, 1), 'mostly_low': (6, 3, 1), 'mostly_high': (1, 3, 6)}
+
+DEADLINES = ('loose', 'tight')
+
+WORKDAY_START_HOUR = 8
+WORKDAY_HOURS = 10
+DURATIONS = (0.5, 1, 1.5, 2, 3)
+COMPLETED_RATIO = 0.1
+
+
+def _quarter(hours):
+    # Bulatkan ke 15 menit, seperti input dari form
+    return round(hours * 4) / 4
+
+
+def generate_tasks(size, seed=0, density='medium', priority_mix='uniform', deadline='loose', base_time=None):
+    """Buat daftar tugas berbentuk baris tabel tasks.
+
+    Window jatuh di jam kerja hari-hari mulai besok; jumlah hari dipilih
+    supaya jam kerja terisi sebesar DENSITIES[density]. Deadline 'loose'
+    jatuh beberapa hari setelah window, 'tight' di dalam window.
+    """
+    rng = random.Random(f'{seed}-{size}-{density}-{priority_mix}-{deadline}')
+    base = (base_time or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+    average_duration = sum(DURATIONS) / len(DURATIONS)
+    days = max(1, round(size * average_duration / (WORKDAY_HOURS * DENSITIES[density])))
+
+    tasks = []
+    for i in range(size):
+        duration = rng.choice(DURATIONS)
+        window_hours = _quarter(rng.uniform(duration, WORKDAY_HOURS))
+        start_hour = WORKDAY_START_HOUR + _quarter(rng.uniform(0, WORKDAY_HOURS - window_hours))
+
+        window_start = base + timedelta(days=rng.randrange(days), hours=start_hour)
+        window_end = window_start + timedelta(hours=window_hours)
+        if deadline == 'loose':
+            deadline_dt = window_end + timedelta(days=rng.randint(1, 7))
+        else:
+            slack = _quarter(rng.uniform(0, window_hours - duration))
+            deadline_dt = window_start + timedelta(hours=duration + slack)
+
+        tasks.append({
+            'id': i + 1,
+            'name': f'Task {i + 1}',
+            'duration': str(duration),
+            'priority': rng.choices(('1', '2', '3'), weights=PRIORITY_MIXES[priority_mix])[0],
+            'deadline': deadline_dt.isoformat(),
+            'window_start': window_start.isoformat(),
+            'window_end': window_end.isoformat(),
+            'status': 'Completed' if rng.random() < COMPLETED_RATIO else 'Not Completed',
+            'start_time': None,
+            'end_time': None,
+            'conflict': 0,
+        })
+    return tasks
+
+
+def run_case(case, solver_args=(), timeout=None):
+    tasks = generate_tasks(**case)
+    started = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [sys.executable, SOLVER_PATH, '--instrument', *solver_args],
+            input=json.dumps(tasks), capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {**case, 'status': 'TIMEOUT', 'wall_seconds': time.perf_counter() - started}
+    wall_seconds = time.perf_counter() - started
+
+    record = None
+    for line in proc.stderr.splitlines():
+        try:
+            parsed = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(parsed, dict) and parsed.get('event') == 'instrumentation':
+            record = parsed
+
+    if proc.returncode != 0 or record is None:
+        return {**case, 'status': 'ERROR', 'wall_seconds': wall_seconds, 'stderr': proc.stderr[-2000:]}
+
+    record.pop('event')
+    return {**case, **record, 'wall_seconds': wall_seconds}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(SOLVER_PATH), capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _ortools_version():
+    try:
+        import ortools
+    except ImportError:
+        return None
+    return ortools.__version__
+
+
+def _case_key(result):
+    return (result['size'], result['seed'], result['density'], result['priority_mix'], result['deadline'])
+
+
+def compare(results, baseline):
+    """Cetak perbandingan waktu terhadap hasil benchmark sebelumnya."""
+    previous = {_case_key(r): r for r in baseline['results']}
+    print(f"Dibandingkan dengan {baseline['meta'].get('commit') or 'baseline'}:")
+    print(f"{'size':>6} {'density':>8} {'priority':>12} {'deadline':>8} {'wall':>9} {'ratio':>7}  status")
+    for result in results:
+        old = previous.get(_case_key(result))
+        ratio = ''
+        status = result['status']
+        if old is not None:
+            if old.get('wall_seconds'):
+                ratio = f"{result['wall_seconds'] / old['wall_seconds']:.2f}x"
+            if old['status'] != result['status']:
+                status = f"{old['status']} -> {result['status']}"
+        print(f"{result['size']:>6} {result['density']:>8} {result['priority_mix']:>12} {result['deadline']:>8} "
+              f"{result['wall_seconds']:>8.3f}s {ratio:>7}  {status}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark solver Solveria')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--densities', nargs='+', choices=DENSITIES, default=list(DENSITIES))
+    parser.add_argument('--priority-mixes', nargs='+', choices=PRIORITY_MIXES, default=['uniform'])
+    parser.add_argument('--deadlines', nargs='+', choices=DEADLINES, default=list(DEADLINES))
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0])
+    parser.add_argument('--time-limit', type=float, default=10.0, help='Diteruskan ke solver.py')
+    parser.add_argument('--engine', default=None, help='Diteruskan ke solver.py')
+    parser.add_argument('--timeout', type=float, default=300.0, help='Batas waktu per kasus (detik)')
+    parser.add_argument('--output', help='Tulis hasil ke file JSON ini')
+    parser.add_argument('--compare', help='File JSON hasil benchmark sebelumnya')
+    args = parser.parse_args()
+
+    solver_args = ['--time-limit', str(args.time_limit)]
+    if args.engine:
+        solver_args += ['--engine', args.engine]
+
+    results = []
+    for size, seed, density, priority_mix, deadline in itertools.product(
+            args.sizes, args.seeds, args.densities, args.priority_mixes, args.deadlines):
+        case = {'size': size, 'seed': seed, 'density': density, 'priority_mix': priority_mix, 'deadline': deadline}
+        result = run_case(case, solver_args, args.timeout)
+        results.append(result)
+        print(f"{size:>6} {density:>8} {priority_mix:>12} {deadline:>8}  "
+              f"{result['wall_seconds']:8.3f}s  {result['status']}", file=sys.stderr)
+
+    output = {
+        'meta': {
+            'commit': _git_commit(),
+            'created': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'ortools': _ortools_version(),
+            'platform': platform.platform(),
+            'solver_args': solver_args,
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+    else:
+        print(json.dumps(output, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
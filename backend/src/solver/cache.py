@@ -0,0 +1,203 @@
+# backend/src/solver/cache.py
+#
+# Cache hasil solve per kelompok tugas (lihat split_clusters di solver.py).
+#
+# Kunci cache adalah hash dari isi tugas (nama, durasi, prioritas, window,
+# deadline) dengan window dinyatakan relatif terhadap awal horizon kelompok,
+# yaitu window_start paling awal. Bobot prioritas bergantung pada jarak
+# deadline dari sekarang, jadi awal horizon itu sendiri dan deadline apa
+# adanya (relatif terhadap base_time solver) ikut masuk kunci: hit berarti
+# masalahnya persis sama, sehingga jadwal tersimpan tetap optimal dan bisa
+# dipakai langsung. Kunci tidak bergantung pada id tugas; nama ikut karena
+# alasan konflik yang tersimpan menyebut nama tugas.
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+DISK_SWEEP_INTERVAL = 64
+
+
+def cluster_key(preprocessed_tasks):
+    """Hitung (key, origin, ordered_ids) untuk satu kelompok tugas.
+
+    origin adalah awal horizon dalam menit relatif terhadap base_time solver;
+    ordered_ids adalah urutan kanonik tugas, yang juga dipakai sebagai urutan
+    jadwal yang disimpan.
+    """
+    origin = min(int(p_task['window_start_minutes']) for p_task in preprocessed_tasks)
+
+    rows = []
+    for p_task in preprocessed_tasks:
+        rows.append(((
+            p_task['duration_minutes'],
+            p_task['priority'],
+            int(p_task['window_start_minutes']) - origin,
+            int(p_task['window_end_minutes']) - origin,
+            p_task['deadline_minutes'],
+            p_task['name'],
+            bool(p_task.get('fixed')),
+        ), p_task['id']))
+    rows.sort(key=lambda row: row[0])
+
+    canonical = json.dumps([origin, [content for content, _ in rows]], separators=(',', ':'))
+    key = hashlib.sha256(canonical.encode()).hexdigest()
+    return key, origin, [task_id for _, task_id in rows]
+
+
+class ScheduleCache:
+    """LRU di memori dengan penyimpanan opsional di disk.
+
+    Setiap entri berisi jadwal relatif terhadap origin: daftar [start, end]
+    dalam menit (None untuk tugas yang tidak dijadwalkan), sesuai urutan
+    ordered_ids dari cluster_key, ditambah alasan konflik per posisi. Entri
+    dianggap basi begitu ada tugas yang start-nya sudah lewat, atau umurnya
+    melebihi ttl detik, dan langsung dibuang.
+    """
+
+    def __init__(self, max_entries=1024, directory=None, max_disk_entries=10000, ttl=24 * 60 * 60):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.disk_writes = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key, origin):
+        """Ambil (schedule, unscheduled) untuk key, atau None.
+
+        unscheduled berupa {posisi: alasan} untuk entri schedule yang None.
+        origin adalah awal horizon kelompok saat ini dalam menit relatif
+        terhadap sekarang; dipakai untuk memeriksa apakah start tersimpan
+        sudah lewat.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self._read_disk(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expired = time.time() - entry['created'] > self.ttl
+            starts = [pair[0] for pair in entry['schedule'] if pair is not None]
+            started = bool(starts) and origin + min(starts) < 0
+            if expired or started:
+                self.stale += 1
+                self.misses += 1
+                self._remove(key)
+                return None
+
+            self.hits += 1
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self._evict_memory()
+            unscheduled = {int(position): reason for position, reason in entry.get('unscheduled', {}).items()}
+            return entry['schedule'], unscheduled
+
+    def reject(self, key):
+        """Batalkan hit terakhir untuk key karena entrinya tidak jadi dipakai.
+
+        Dihitung sebagai stale (dan miss) lalu entrinya dibuang, sehingga
+        stats() hanya menghitung hit yang benar-benar dipakai.
+        """
+        with self.lock:
+            self.hits -= 1
+            self.stale += 1
+            self.misses += 1
+            self._remove(key)
+
+    def put(self, key, schedule, unscheduled=None):
+        entry = {
+            'created': time.time(),
+            'schedule': [None if pair is None else list(pair) for pair in schedule],
+            # Kunci JSON selalu string
+            'unscheduled': {str(position): reason for position, reason in (unscheduled or {}).items()},
+        }
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self._evict_memory()
+            self._write_disk(key, entry)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'entries': len(self.entries),
+            }
+
+    def _evict_memory(self):
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _remove(self, key):
+        self.entries.pop(key, None)
+        if self.directory:
+            _unlink(self._path(key))
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key, entry):
+        if not self.directory:
+            return
+        # Tulis ke file sementara dulu supaya pembaca lain tidak melihat file setengah jadi
+        tmp_path = f'{self._path(key)}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(key))
+        self._evict_disk()
+
+    def _evict_disk(self):
+        # Menyapu direktori tiap put terlalu mahal, cukup sesekali
+        self.disk_writes += 1
+        if self.disk_writes % DISK_SWEEP_INTERVAL:
+            return
+
+        now = time.time()
+        remaining = []
+        for e in os.scandir(self.directory):
+            if not e.name.endswith('.json'):
+                continue
+            try:
+                mtime = e.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if now - mtime > self.ttl:
+                _unlink(e.path)
+            else:
+                remaining.append((mtime, e.path))
+
+        if len(remaining) > self.max_disk_entries:
+            remaining.sort()
+            for _, path in remaining[:len(remaining) - self.max_disk_entries]:
+                _unlink(path)
+
+
+def _unlink(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass  # Sudah dihapus proses lain
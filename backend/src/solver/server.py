@@ -0,0 +1,192 @@
+# backend/src/solver/server.py
+#
+# Mode daemon untuk solver: satu proses Python yang hidup lama sehingga
+# biaya startup interpreter dan import ortools hanya dibayar sekali.
+#
+# Protokol: newline-delimited JSON. Setiap baris request berbentuk
+#   {"id": <any>, "tasks": [...], "options": {...}}
+# di mana "options" (opsional) diteruskan sebagai keyword argument ke
+# solve_schedule, mis. {"incremental": true, "changed_ids": [3]}.
+# dan setiap baris response berbentuk
+#   {"id": <any>, "result": [...], "report": {...}}  atau  {"id": <any>, "error": "..."}
+# Response bisa keluar tidak berurutan, cocokkan berdasarkan "id".
+#
+# Dengan {"options": {"stream": true, ...}} setiap jadwal yang membaik dikirim
+# lebih dulu sebagai {"id": <any>, "event": "solution", "schedule": [...], "report": {...}}
+# sebelum baris "result" terakhir.
+#
+# Dengan {"options": {"diff": true, ...}} response (dan event) juga berisi
+# "changed", yaitu hanya tugas yang penugasannya berubah dibanding baris
+# input, dan response menyertakan "summary" (lihat diff_schedule di solver.py).
+# "result" tetap berisi jadwal lengkap.
+#
+# Tanpa "num_workers" di options, setiap request memakai --num-workers (default:
+# jumlah core dibagi --workers) supaya request yang berjalan bersamaan tidak
+# masing-masing meminta semua core untuk CP-SAT.
+#
+# Request {"id": <any>, "command": "stats"} mengembalikan statistik cache
+# hasil solve: {"id": <any>, "stats": {"hits": .., "misses": .., ...}}.
+#
+# Pemakaian:
+#   python src/solver/server.py                      # stdin/stdout
+#   python src/solver/server.py --socket /tmp/s.sock # Unix socket
+import sys
+import os
+import json
+import argparse
+import threading
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+
+from solver import solve, diff_schedule, use_process_pool
+from cache import ScheduleCache
+
+DEFAULT_WORKERS = os.cpu_count() or 2
+
+
+def handle_line(line, respond, cache=None, num_workers=None):
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {'id': None, 'error': f'Input JSON tidak valid: {e}'}
+
+    if isinstance(request, dict) and request.get('command') == 'stats':
+        return {'id': request.get('id'), 'stats': cache.stats() if cache else None}
+
+    if not isinstance(request, dict) or not isinstance(request.get('tasks'), list):
+        request_id = request.get('id') if isinstance(request, dict) else None
+        return {'id': request_id, 'error': 'Request harus berisi "tasks" berupa list.'}
+
+    request_id = request.get('id')
+    try:
+        options = dict(request.get('options') or {})
+        diff = options.pop('diff', False)
+        if options.pop('stream', False):
+            def on_solution(schedule, report):
+                event = {'id': request_id, 'event': 'solution', 'schedule': schedule, 'report': report}
+                if diff:
+                    event['changed'], _ = diff_schedule(request['tasks'], schedule)
+                respond(event)
+            options['on_solution'] = on_solution
+        options['cache'] = cache
+        if num_workers:
+            options.setdefault('num_workers', num_workers)
+
+        schedule, report = solve(request['tasks'], **options)
+        response = {'id': request_id, 'result': schedule, 'report': report}
+        if diff:
+            response['changed'], response['summary'] = diff_schedule(request['tasks'], schedule)
+        return response
+    except Exception as e:
+        return {'id': request_id, 'error': f'{type(e).__name__}: {e}'}
+
+
+class WorkerPool:
+    """Thread pool dengan antrean terbatas.
+
+    CP-SAT melepas GIL selama Solve, jadi thread cukup untuk paralelisme.
+    submit() akan blok saat antrean penuh sehingga pembaca request ikut
+    tertahan (backpressure) alih-alih menumpuk pekerjaan tanpa batas.
+    """
+
+    def __init__(self, max_workers, max_pending=None, cache=None, num_workers=None):
+        self.cache = cache
+        # Core dibagi rata di antara request yang berjalan bersamaan
+        self.num_workers = num_workers or max(1, (os.cpu_count() or 1) // max_workers)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.slots = threading.BoundedSemaphore(max_pending or max_workers * 2)
+
+    def submit(self, line, respond):
+        self.slots.acquire()
+
+        def run():
+            try:
+                respond(handle_line(line, respond, self.cache, self.num_workers))
+            finally:
+                self.slots.release()
+
+        return self.executor.submit(run)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+def serve_stdio(pool):
+    write_lock = threading.Lock()
+
+    def respond(response):
+        with write_lock:
+            sys.stdout.write(json.dumps(response) + '\n')
+            sys.stdout.flush()
+
+    for line in sys.stdin:
+        if line.strip():
+            pool.submit(line, respond)
+
+
+def serve_unix(pool, path):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            write_lock = threading.Lock()
+
+            def respond(response):
+                with write_lock:
+                    try:
+                        self.wfile.write((json.dumps(response) + '\n').encode())
+                        self.wfile.flush()
+                    except (OSError, ValueError):
+                        pass  # Klien sudah menutup koneksi
+
+            pending = []
+            for raw in self.rfile:
+                line = raw.decode()
+                if line.strip():
+                    pending = [f for f in pending if not f.done()]
+                    pending.append(pool.submit(line, respond))
+
+            # Tunggu response yang masih berjalan sebelum koneksi ditutup
+            for future in pending:
+                future.result()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(path):
+        os.unlink(path)
+
+    with Server(path, Handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Solveria solver daemon')
+    parser.add_argument('--socket', help='Path Unix socket; default stdin/stdout')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--max-pending', type=int, default=None)
+    parser.add_argument('--num-workers', type=int, default=None,
+                        help='Worker CP-SAT per request jika tidak diisi di options; default jumlah core dibagi --workers')
+    parser.add_argument('--cache-size', type=int, default=1024,
+                        help='Jumlah entri cache di memori; 0 mematikan cache')
+    parser.add_argument('--cache-dir', default=None, help='Direktori cache di disk (opsional)')
+    parser.add_argument('--cache-ttl', type=float, default=24 * 60 * 60, help='Umur maksimum entri cache (detik)')
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache_size > 0:
+        cache = ScheduleCache(max_entries=args.cache_size, directory=args.cache_dir, ttl=args.cache_ttl)
+
+    # Daemon hidup lama, jadi process pool untuk kelompok tugas sepadan dibuat sekali
+    use_process_pool()
+    pool = WorkerPool(args.workers, args.max_pending, cache, args.num_workers)
+    try:
+        if args.socket:
+            serve_unix(pool, args.socket)
+        else:
+            serve_stdio(pool)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.shutdown()
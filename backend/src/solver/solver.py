@@ -1,36 +1,105 @@
 # backend/src/solver/solver.py
 import sys
+import os
 import json
+import math
+import argparse
+import time
+import heapq
+import bisect
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from ortools.sat.python import cp_model
 from datetime import datetime
 
-def solve_schedule(tasks):
-    model = cp_model.CpModel()
-    MINUTES_PER_HOUR = 60
-    base_time = datetime.now()
-    
-    preprocessed_tasks = []
+from cache import ScheduleCache, cluster_key
+
+def parse_time(value):
+    # Waktu dari database bisa berupa string ISO dengan zona (mis. '...Z' dari mysql2);
+    # samakan ke waktu lokal naif seperti base_time. ValueError jika formatnya tidak valid
+    parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def _parse_stored_time(value, base_time):
+    # start_time/end_time dari solve sebelumnya, dalam menit relatif terhadap base_time
+    if not value:
+        return None
+    try:
+        return round((parse_time(value) - base_time).total_seconds() / 60)
+    except ValueError:
+        return None
+
+def _overlaps(start_a, end_a, start_b, end_b):
+    return start_a < end_b and start_b < end_a
+
+def _changed_windows(tasks, base_time, changed_ids):
+    # Window dari tugas yang berubah, termasuk tugas yang baru saja diselesaikan
+    windows = []
     for task in tasks:
+        if task.get('id') not in changed_ids:
+            continue
         try:
-            # Skip tasks that are not to be scheduled
-            if task.get('status') != 'Not Completed':
-                continue
-                
-            deadline_dt = datetime.fromisoformat(task['deadline'])
-            window_start_dt = datetime.fromisoformat(task['window_start'])
-            window_end_dt = datetime.fromisoformat(task['window_end'])
-            
-            preprocessed_tasks.append({
-                'id': task['id'],
-                'name': task['name'],
-                'duration_minutes': int(float(task['duration']) * MINUTES_PER_HOUR),
-                'priority': int(task.get('priority', '1')),  # Default to lowest priority if not set
-                'deadline_minutes': (deadline_dt - base_time).total_seconds() / 60,
-                'window_start_minutes': (window_start_dt - base_time).total_seconds() / 60,
-                'window_end_minutes': (window_end_dt - base_time).total_seconds() / 60,
-            })
-        except (ValueError, KeyError) as e:
-            return [{'id': task.get('id'), 'name': task.get('name', 'Unknown Task'), 'conflict': True, 'reason': 'Data tugas tidak valid.'}]
+            window_start = (parse_time(task['window_start']) - base_time).total_seconds() / 60
+            window_end = (parse_time(task['window_end']) - base_time).total_seconds() / 60
+        except (ValueError, KeyError):
+            continue
+        windows.append((window_start, window_end))
+    return windows
+
+def plan_incremental(preprocessed_tasks, tasks, base_time, changed_ids=None, lazy_ids=None):
+    """Tentukan hint dan tugas yang dibekukan untuk re-solve inkremental.
+
+    Setiap tugas dengan start_time/end_time tersimpan mendapat hint dari nilai
+    tersebut. Tugas yang intervalnya tidak bersinggungan dengan window tugas
+    yang berubah dibekukan di posisi lamanya. Tugas tanpa waktu tersimpan
+    (baru ditambah atau baru diedit) selalu dianggap berubah. Tugas di
+    lazy_ids dibekukan dengan aturan yang sama walaupun tidak ada tugas yang
+    berubah.
+    """
+    original_tasks_map = {task['id']: task for task in tasks}
+    changed_ids = set(changed_ids or [])
+    lazy_ids = set(lazy_ids or [])
+
+    hints = {}
+    for p_task in preprocessed_tasks:
+        original = original_tasks_map[p_task['id']]
+        start = _parse_stored_time(original.get('start_time'), base_time)
+        end = _parse_stored_time(original.get('end_time'), base_time)
+        if start is None or end is None or end - start != p_task['duration_minutes']:
+            changed_ids.add(p_task['id'])
+        else:
+            hints[p_task['id']] = (start, end)
+
+    windows = _changed_windows(tasks, base_time, changed_ids)
+
+    frozen = {}
+    for p_task in preprocessed_tasks:
+        task_id = p_task['id']
+        if not windows and task_id not in lazy_ids:
+            continue
+        if task_id in changed_ids or task_id not in hints:
+            continue
+        start, end = hints[task_id]
+        if start < int(p_task['window_start_minutes']):
+            continue
+        if end > min(int(p_task['window_end_minutes']), int(p_task['deadline_minutes'])):
+            continue
+        if any(_overlaps(start, end, w_start, w_end) for w_start, w_end in windows):
+            continue
+        frozen[task_id] = (start, end)
+
+    return hints, frozen
+
+def build_model(preprocessed_tasks, hints=None, frozen=None, optional=False):
+    # optional=True: setiap tugas punya literal 'present' dan boleh tidak dijadwalkan
+    model = cp_model.CpModel()
+    hints = hints or {}
+    frozen = frozen or {}
 
     intervals = []
     task_vars = {}
@@ -42,19 +111,30 @@ def solve_schedule(tasks):
         window_end = int(p_task['window_end_minutes'])
         deadline = int(p_task['deadline_minutes'])
 
-        if duration <= 0 or window_end <= window_start:
-            return [{'id': p_task['id'], 'name': name, 'conflict': True, 'reason': 'Durasi atau window tidak valid.'}]
-
         start_var = model.NewIntVar(window_start, window_end, f'start_{name}_{p_task["id"]}')
         end_var = model.NewIntVar(window_start, window_end, f'end_{name}_{p_task["id"]}')
-        interval_var = model.NewIntervalVar(start_var, duration, end_var, f'interval_{name}_{p_task["id"]}')
+        if optional:
+            present_var = model.NewBoolVar(f'present_{name}_{p_task["id"]}')
+            interval_var = model.NewOptionalIntervalVar(
+                start_var, duration, end_var, present_var, f'interval_{name}_{p_task["id"]}')
+        else:
+            present_var = None
+            interval_var = model.NewIntervalVar(start_var, duration, end_var, f'interval_{name}_{p_task["id"]}')
         
         model.Add(end_var <= deadline)
         model.Add(start_var >= window_start)
         model.Add(end_var <= window_end)
         
+        if p_task['id'] in frozen:
+            model.Add(start_var == frozen[p_task['id']][0])
+        elif p_task['id'] in hints:
+            hint_start, hint_end = hints[p_task['id']]
+            if window_start <= hint_start and hint_end <= window_end:
+                model.AddHint(start_var, hint_start)
+                model.AddHint(end_var, hint_end)
+
         intervals.append(interval_var)
-        task_vars[p_task['id']] = {'start': start_var, 'end': end_var, 'interval': interval_var}
+        task_vars[p_task['id']] = {'start': start_var, 'end': end_var, 'interval': interval_var, 'present': present_var}
 
     model.AddNoOverlap(intervals)
     
@@ -63,67 +143,1071 @@ def solve_schedule(tasks):
         task_id = p_task['id']
         end_var = task_vars[task_id]['end']
         
-        # Higher priority tasks (3) should have lower end times than lower priority tasks (1)
-        priority_weight = 1.0 / ((4 - p_task['priority']) * (p_task['deadline_minutes'] + 1))
-        
-        objective_terms.append(end_var * priority_weight)
+        objective_terms.append(end_var * _priority_weight(p_task))
 
     model.Minimize(sum(objective_terms))
 
+    return model, task_vars
+
+def _priority_weight(p_task):
+    # Higher priority tasks (3) should have lower end times than lower priority tasks (1).
+    # Deadline yang sudah lewat dihitung sebagai 0 menit lagi (paling mendesak) supaya
+    # penyebutnya tidak pernah nol atau negatif
+    return 1.0 / ((4 - p_task['priority']) * (max(p_task['deadline_minutes'], 0) + 1))
+
+def _due(p_task):
+    return min(int(p_task['window_end_minutes']), int(p_task['deadline_minutes']))
+
+def _first_fit(blocked, start, duration):
+    # Geser start sampai [start, start + duration) tidak menabrak interval yang sudah terkunci
+    for blocked_start, blocked_end in blocked:
+        if blocked_end <= start:
+            continue
+        if start + duration <= blocked_start:
+            break
+        start = blocked_end
+    return start
+
+def greedy_schedule(preprocessed_tasks, frozen=None, skip_late=False):
+    """List scheduler earliest-deadline-first.
+
+    Di setiap titik waktu, dari tugas yang window-nya sudah terbuka dipilih
+    tugas dengan batas akhir paling awal; jika sama, yang bobot per menitnya
+    paling besar. Tugas beku tetap di tempatnya. Mengembalikan
+    {task_id: (start, end)} atau None jika ada tugas yang melewati batasnya.
+    Dengan skip_late=True tugas seperti itu dilewati saja, sehingga hasilnya
+    selalu berupa jadwal untuk sebagian tugas.
+    """
+    frozen = frozen or {}
+    blocked = sorted(frozen.values())
+    assignments = dict(frozen)
+
+    pending = sorted(
+        (p_task for p_task in preprocessed_tasks if p_task['id'] not in frozen),
+        key=lambda t: int(t['window_start_minutes']),
+    )
+    ready = []
+    current = None
+    i = 0
+    while i < len(pending) or ready:
+        if not ready:
+            release = int(pending[i]['window_start_minutes'])
+            current = release if current is None else max(current, release)
+        while i < len(pending) and int(pending[i]['window_start_minutes']) <= current:
+            p_task = pending[i]
+            ratio = _priority_weight(p_task) / p_task['duration_minutes']
+            heapq.heappush(ready, (_due(p_task), -ratio, i, p_task))
+            i += 1
+
+        due, _, _, p_task = heapq.heappop(ready)
+        start = _first_fit(blocked, current, p_task['duration_minutes'])
+        end = start + p_task['duration_minutes']
+        if end > due:
+            if skip_late:
+                continue
+            return None
+        assignments[p_task['id']] = (start, end)
+        current = end
+
+    return assignments
+
+def _proven_optimal(objective, bound):
+    return objective <= bound + 1e-9 * max(1.0, abs(bound))
+
+def schedule_objective(preprocessed_tasks, assignments):
+    return sum(_priority_weight(p_task) * assignments[p_task['id']][1] for p_task in preprocessed_tasks)
+
+def objective_lower_bound(preprocessed_tasks, frozen=None):
+    """Batas bawah murah untuk objektif satu kelompok tugas.
+
+    Diambil yang terbesar dari dua relaksasi: setiap tugas selesai sedini
+    mungkin tanpa memperhatikan tugas lain, dan semua tugas dikerjakan
+    berurutan sejak window paling awal tanpa batas akhir (untuk relaksasi
+    ini aturan Smith, urut rasio bobot/durasi menurun, sudah optimal).
+    Jika jadwal greedy mencapai nilai ini, jadwal itu pasti optimal.
+    """
+    frozen = frozen or {}
+    weights = {p_task['id']: _priority_weight(p_task) for p_task in preprocessed_tasks}
+
+    bound = 0.0
+    for p_task in preprocessed_tasks:
+        if p_task['id'] in frozen:
+            end = frozen[p_task['id']][1]
+        else:
+            end = int(p_task['window_start_minutes']) + p_task['duration_minutes']
+        bound += weights[p_task['id']] * end
+
+    if frozen or not preprocessed_tasks:
+        return bound
+
+    current = min(int(p_task['window_start_minutes']) for p_task in preprocessed_tasks)
+    smith_bound = 0.0
+    for p_task in sorted(preprocessed_tasks, key=lambda t: weights[t['id']] / t['duration_minutes'], reverse=True):
+        current += p_task['duration_minutes']
+        smith_bound += weights[p_task['id']] * current
+    return max(bound, smith_bound)
+
+def static_conflict_reason(p_task):
+    # Alasan tugas mustahil dijadwalkan terlepas dari tugas lain, atau None
+    window_start = int(p_task['window_start_minutes'])
+    if p_task['duration_minutes'] <= 0 or int(p_task['window_end_minutes']) <= window_start:
+        return 'Durasi atau window tidak valid.'
+    if int(p_task['deadline_minutes']) <= window_start:
+        return 'Deadline sebelum window dimulai.'
+    if _due(p_task) - window_start < p_task['duration_minutes']:
+        return 'Window terlalu pendek untuk durasi tugas.'
+    return None
+
+def explain_conflict(p_task, scheduled_tasks, deadline=None, stats=None):
+    """Cari tugas terjadwal yang membuat p_task tidak muat.
+
+    p_task diwajibkan hadir, sedangkan kehadiran setiap tugas lain yang
+    window-nya bersinggungan dijadikan assumption. Jika modelnya infeasible,
+    core dari CP-SAT adalah himpunan tugas yang bersama-sama menutup window
+    p_task. Setelah deadline lewat, alasan umum dikembalikan tanpa memanggil
+    solver.
+    """
+    if deadline is not None and time.time() >= deadline:
+        return 'Tidak bisa dijadwalkan.'
+
+    neighbours = [
+        other for other in scheduled_tasks
+        if _overlaps(int(other['window_start_minutes']), int(other['window_end_minutes']),
+                     int(p_task['window_start_minutes']), int(p_task['window_end_minutes']))
+    ]
+    stats = stats if stats is not None else _new_stats()
+    model, task_vars = _timed_build(stats, [p_task] + neighbours, optional=True)
+    model.ClearObjective()
+    model.Add(task_vars[p_task['id']]['present'] == 1)
+    model.AddAssumptions([task_vars[other['id']]['present'] for other in neighbours])
+
+    # Core paling ringkas didapat dengan satu worker
+    solver = _new_solver(deadline, 1)
+    if _timed_solve(stats, solver, model) != cp_model.INFEASIBLE:
+        return 'Tidak bisa dijadwalkan.'
+
+    core = set(solver.SufficientAssumptionsForInfeasibility())
+    names = [other['name'] for other in neighbours if task_vars[other['id']]['present'].Index() in core]
+    if not names:
+        return 'Tidak bisa dijadwalkan.'
+    return f"Bertabrakan dengan tugas: {', '.join(names)}."
+
+# Bagian sisa waktu untuk memilih subset di solve_partial, lalu bagian yang sama dari
+# sisanya untuk alasan konflik; yang tersisa dipakai solve_cluster untuk re-solve subset
+PARTIAL_TIME_SHARE = 0.5
+
+def _share_deadline(deadline, share):
+    if deadline is None:
+        return None
+    return time.time() + max(deadline - time.time(), 0.0) * share
+
+def solve_partial(preprocessed_tasks, deadline=None, num_workers=None, stats=None):
+    """Pilih subset tugas dengan total prioritas maksimum yang masih muat.
+
+    Mengembalikan (scheduled_tasks, unscheduled, assignments, proven) dengan
+    unscheduled berupa {task_id: alasan}, assignments jadwal feasible untuk
+    scheduled_tasks, dan proven True jika subset terbukti optimal dan semua
+    alasan sempat dicari sebelum deadline. Jika CP-SAT tidak menemukan subset sebelum
+    deadline, subset diambil dari greedy_schedule(skip_late=True). Waktu
+    dibagi menurut PARTIAL_TIME_SHARE.
+    """
+    stats = stats if stats is not None else _new_stats()
+    # Tugas semu berposisi tetap (lihat _coarse_blockers) tidak boleh dilepas
+    fixed = {
+        p_task['id']: (int(p_task['window_start_minutes']), int(p_task['window_end_minutes']))
+        for p_task in preprocessed_tasks if p_task.get('fixed')
+    }
+
+    assignments = None
+    proven = False
+    if deadline is None or time.time() < deadline:
+        model, task_vars = _timed_build(stats, preprocessed_tasks, optional=True)
+        model.Maximize(sum(p_task['priority'] * task_vars[p_task['id']]['present'] for p_task in preprocessed_tasks))
+        for task_id in fixed:
+            model.Add(task_vars[task_id]['present'] == 1)
+
+        solver = _new_solver(_share_deadline(deadline, PARTIAL_TIME_SHARE), num_workers)
+        status = _timed_solve(stats, solver, model)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            proven = status == cp_model.OPTIMAL
+            assignments = {
+                task_id: (solver.Value(v['start']), solver.Value(v['end']))
+                for task_id, v in task_vars.items() if solver.Value(v['present'])
+            }
+
+    if assignments is None:
+        started = time.perf_counter()
+        assignments = greedy_schedule(preprocessed_tasks, fixed, skip_late=True)
+        stats['greedy_seconds'] += time.perf_counter() - started
+
+    scheduled = [p_task for p_task in preprocessed_tasks if p_task['id'] in assignments]
+    explain_deadline = _share_deadline(deadline, PARTIAL_TIME_SHARE)
+    unscheduled = {
+        p_task['id']: explain_conflict(p_task, scheduled, explain_deadline, stats)
+        for p_task in preprocessed_tasks
+        if p_task['id'] not in assignments
+    }
+    # Alasan yang dilewati karena waktu habis hanya berupa alasan umum
+    proven = proven and (explain_deadline is None or time.time() < explain_deadline)
+    return scheduled, unscheduled, assignments, proven
+
+# Di bawah jumlah tugas ini, overhead pengiriman ke process pool lebih mahal daripada solve-nya
+PARALLEL_MIN_TASKS = 50
+
+_cluster_pool = None
+_cluster_pool_lock = threading.Lock()
+_use_process_pool = False
+
+def use_process_pool(enabled=True):
+    """Selesaikan kelompok di process pool yang dipakai ulang antar request.
+
+    Hanya sepadan untuk proses yang hidup lama (server.py): startup worker
+    spawn dan import ortools di tiap worker lebih mahal daripada solve satu
+    kali jalan. Tanpa ini kelompok diselesaikan di thread, yang tetap paralel
+    karena CP-SAT melepas GIL selama Solve.
+    """
+    global _use_process_pool
+    _use_process_pool = enabled
+
+def _get_cluster_pool():
+    # Pool dibuat sekali dan dipakai ulang, terutama penting dalam mode daemon
+    global _cluster_pool
+    with _cluster_pool_lock:
+        if _cluster_pool is None:
+            _cluster_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        return _cluster_pool
+
+def _reset_cluster_pool(broken):
+    # Pool yang worker-nya mati (mis. dibunuh OOM killer) tidak bisa dipakai lagi;
+    # buang supaya _get_cluster_pool membuat yang baru pada request berikutnya
+    global _cluster_pool
+    with _cluster_pool_lock:
+        if _cluster_pool is broken:
+            _cluster_pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+def split_clusters(preprocessed_tasks):
+    """Pisahkan tugas menjadi kelompok dengan window yang saling bersinggungan.
+
+    Tugas dari kelompok berbeda tidak mungkin saling tumpang tindih, dan
+    objektifnya terpisah per tugas, sehingga tiap kelompok bisa diselesaikan
+    sebagai model sendiri tanpa mengubah solusi optimal.
+    """
+    ordered = sorted(preprocessed_tasks, key=lambda t: t['window_start_minutes'])
+
+    clusters = []
+    cluster_end = None
+    for p_task in ordered:
+        window_start = int(p_task['window_start_minutes'])
+        window_end = int(p_task['window_end_minutes'])
+        if clusters and window_start < cluster_end:
+            clusters[-1].append(p_task)
+            cluster_end = max(cluster_end, window_end)
+        else:
+            clusters.append([p_task])
+            cluster_end = window_end
+    return clusters
+
+class _SolutionCallback(cp_model.CpSolverSolutionCallback):
+    # Meneruskan setiap solusi yang membaik ke on_solution(assignments, objective, best_bound)
+    def __init__(self, task_vars, on_solution):
+        super().__init__()
+        self.task_vars = task_vars
+        self.on_solution = on_solution
+
+    def on_solution_callback(self):
+        assignments = {
+            task_id: (self.Value(v['start']), self.Value(v['end']))
+            for task_id, v in self.task_vars.items()
+        }
+        self.on_solution(assignments, self.ObjectiveValue(), self.BestObjectiveBound())
+
+def _new_stats():
+    # Statistik per kelompok; dijumlahkan di solve_clusters dan dilaporkan di report['stats']
+    return {
+        'greedy_seconds': 0.0,
+        'build_seconds': 0.0,
+        'solve_seconds': 0.0,
+        'cpsat_calls': 0,
+        'num_conflicts': 0,
+        'num_branches': 0,
+    }
+
+def _add_stats(total, stats):
+    for key, value in stats.items():
+        total[key] = total.get(key, 0) + value
+
+def _timed_build(stats, *args, **kwargs):
+    started = time.perf_counter()
+    built = build_model(*args, **kwargs)
+    stats['build_seconds'] += time.perf_counter() - started
+    return built
+
+def _timed_solve(stats, solver, model, callback=None):
+    started = time.perf_counter()
+    status = solver.Solve(model, callback)
+    stats['solve_seconds'] += time.perf_counter() - started
+    stats['cpsat_calls'] += 1
+    stats['num_conflicts'] += solver.NumConflicts()
+    stats['num_branches'] += solver.NumBranches()
+    return status
+
+def _new_solver(deadline=None, num_workers=None):
     solver = cp_model.CpSolver()
-    status = solver.Solve(model)
-
-    result = []
-    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-        solved_tasks = []
-        for p_task in preprocessed_tasks:
-            name = p_task['name']
-            task_id = p_task['id']
-            start_time_minutes = solver.Value(task_vars[task_id]['start'])
-            end_time_minutes = solver.Value(task_vars[task_id]['end'])
-            
-            start_dt = (base_time.timestamp() + start_time_minutes * 60)
-            end_dt = (base_time.timestamp() + end_time_minutes * 60)
+    if deadline is not None:
+        solver.parameters.max_time_in_seconds = max(deadline - time.time(), 0.01)
+    if num_workers:
+        solver.parameters.num_workers = num_workers
+    return solver
+
+ENGINES = ('auto', 'greedy', 'cpsat')
+
+def _greedy_result(preprocessed_tasks, frozen, engine, stats):
+    # (result, greedy): result sudah final jika greedy terbukti optimal, atau cukup
+    # feasible untuk engine 'greedy'; selain itu None dan greedy dipakai sebagai hint
+    started = time.perf_counter()
+    greedy = greedy_schedule(preprocessed_tasks, frozen)
+    stats['greedy_seconds'] += time.perf_counter() - started
+    if greedy is None:
+        return None, None
+
+    objective = schedule_objective(preprocessed_tasks, greedy)
+    bound = objective_lower_bound(preprocessed_tasks, frozen)
+    proven = _proven_optimal(objective, bound)
+    if not proven and engine != 'greedy':
+        return None, greedy
+    return {
+        'status': 'OPTIMAL' if proven else 'FEASIBLE',
+        'assignments': greedy,
+        'objective': objective,
+        'best_bound': bound,
+        'unscheduled': {},
+        'stats': stats,
+    }, greedy
+
+def solve_cluster(preprocessed_tasks, hints=None, frozen=None, deadline=None, num_workers=None,
+                  on_solution=None, engine='auto', partial=True):
+    """Selesaikan satu kelompok tugas.
+
+    deadline adalah batas waktu absolut (time.time()); setelah lewat, solver
+    berhenti dan mengembalikan solusi terbaik yang sudah ditemukan.
+    engine 'greedy' memakai hasil greedy_schedule bila feasible, 'cpsat'
+    selalu memakai CP-SAT, dan 'auto' berhenti di greedy hanya jika terbukti
+    optimal lalu selain itu memakainya sebagai hint CP-SAT untuk tugas yang
+    belum punya hint.
+    Jika kelompok infeasible (atau waktu habis sebelum solusi ditemukan) dan
+    partial=True, hanya subset terbaik yang dijadwalkan (lihat solve_partial).
+    Mengembalikan dict berisi status, assignments ({task_id: (start, end)}
+    dalam menit, None jika tidak ada solusi), objective, best_bound,
+    unscheduled ({task_id: alasan} untuk tugas yang tidak dijadwalkan) dan
+    stats (waktu per fase dan statistik CP-SAT).
+    """
+    stats = _new_stats()
+
+    if engine in ('auto', 'greedy'):
+        result, greedy = _greedy_result(preprocessed_tasks, frozen, engine, stats)
+        if result is not None:
+            if on_solution:
+                on_solution(result['assignments'], result['objective'], result['best_bound'])
+            return result
+        if greedy is not None:
+            # Hint dari waktu tersimpan didahulukan supaya CP-SAT berangkat dari jadwal
+            # sebelumnya; greedy hanya mengisi tugas yang belum punya hint
+            hints = {**greedy, **(hints or {})}
+
+    def run(frozen):
+        model, task_vars = _timed_build(stats, preprocessed_tasks, hints, frozen)
+        solver = _new_solver(deadline, num_workers)
+        callback = _SolutionCallback(task_vars, on_solution) if on_solution else None
+        return solver, _timed_solve(stats, solver, model, callback), task_vars
+
+    solver, status, task_vars = run(frozen)
+    if frozen and status == cp_model.INFEASIBLE:
+        # Pembekuan terlalu ketat, ulangi tanpa membekukan tugas (hint tetap dipakai)
+        solver, status, task_vars = run(None)
+
+    if status in (cp_model.INFEASIBLE, cp_model.UNKNOWN) and partial:
+        scheduled, unscheduled, chosen, proven = solve_partial(preprocessed_tasks, deadline, num_workers, stats)
+        result = None
+        if deadline is None or time.time() < deadline:
+            # Jadwal subset sudah feasible; re-solve hanya memperbaiki objektifnya
+            result = solve_cluster(
+                scheduled, {**chosen, **(hints or {})}, None, deadline, num_workers, on_solution, engine, partial=False)
+            _add_stats(result['stats'], stats)
+        if result is None or result['assignments'] is None:
+            objective = schedule_objective(scheduled, chosen)
+            result = {
+                'status': 'FEASIBLE',
+                'assignments': chosen,
+                'objective': objective,
+                'best_bound': min(objective, objective_lower_bound(scheduled)),
+                'unscheduled': {},
+                'stats': stats if result is None else result['stats'],
+            }
+            if on_solution:
+                on_solution(chosen, objective, result['best_bound'])
+        if not proven:
+            result['status'] = 'FEASIBLE'
+        result['unscheduled'] = unscheduled
+        return result
+
+    result = {
+        'status': solver.StatusName(status),
+        'assignments': None,
+        'objective': None,
+        'best_bound': None,
+        'unscheduled': {},
+        'stats': stats,
+    }
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        result['assignments'] = {
+            task_id: (solver.Value(v['start']), solver.Value(v['end']))
+            for task_id, v in task_vars.items()
+        }
+        result['objective'] = solver.ObjectiveValue()
+        result['best_bound'] = solver.BestObjectiveBound()
+    return result
+
+def _make_report(status, objective=None, best_bound=None):
+    gap = None
+    if objective is not None and best_bound is not None:
+        gap = abs(objective - best_bound) / abs(objective) if objective else 0.0
+    return {'status': status, 'objective': objective, 'best_bound': best_bound, 'gap': gap}
 
-            solved_tasks.append({
+class _ScheduleStream:
+    # Gabungkan solusi per kelompok dan kirim jadwal lengkap setiap kali salah satunya membaik
+    def __init__(self, cluster_count, on_solution):
+        self.best = [None] * cluster_count
+        self.lock = threading.Lock()
+        self.on_solution = on_solution
+
+    def update(self, index, assignments, objective, best_bound):
+        with self.lock:
+            self.best[index] = (assignments, objective, best_bound)
+            if any(b is None for b in self.best):
+                return
+            merged = {}
+            for cluster_assignments, _, _ in self.best:
+                merged.update(cluster_assignments)
+            self.on_solution(
+                merged,
+                sum(b[1] for b in self.best),
+                sum(b[2] for b in self.best),
+            )
+
+def _cached_result(cluster, cached, origin, ordered_ids):
+    # Kunci cache mencakup origin dan deadline dari sekarang, jadi hit adalah masalah
+    # yang persis sama dan jadwal tersimpan (hasil OPTIMAL) bisa dipakai apa adanya
+    schedule, unscheduled_positions = cached
+    assignments = {
+        task_id: (origin + pair[0], origin + pair[1])
+        for task_id, pair in zip(ordered_ids, schedule) if pair is not None
+    }
+    objective = schedule_objective([p_task for p_task in cluster if p_task['id'] in assignments], assignments)
+    return {
+        'status': 'OPTIMAL',
+        'assignments': assignments,
+        'objective': objective,
+        'best_bound': objective,
+        'unscheduled': {ordered_ids[position]: reason for position, reason in unscheduled_positions.items()},
+        'stats': _new_stats(),
+    }
+
+def _cache_entry(r, origin, ordered_ids):
+    schedule = [
+        (r['assignments'][task_id][0] - origin, r['assignments'][task_id][1] - origin)
+        if task_id in r['assignments'] else None
+        for task_id in ordered_ids
+    ]
+    unscheduled = {
+        position: r['unscheduled'][task_id]
+        for position, task_id in enumerate(ordered_ids) if task_id in r['unscheduled']
+    }
+    return schedule, unscheduled
+
+def solve_clusters(clusters, hints=None, frozen=None, parallel=True,
+                   time_limit=None, num_workers=None, on_solution=None, engine='auto', cache=None,
+                   partial=True):
+    """Selesaikan semua kelompok dan gabungkan hasilnya.
+
+    Jika cache (ScheduleCache) diberikan, kelompok tanpa tugas beku diambil
+    dari cache bila ada, dan hasil OPTIMAL yang baru (termasuk alasan untuk
+    tugas yang tidak dijadwalkan) disimpan ke sana.
+    Mengembalikan (assignments, report, unscheduled); assignments None jika
+    ada kelompok yang tidak punya solusi.
+    """
+    hints = hints or {}
+    frozen = frozen or {}
+    deadline = time.time() + time_limit if time_limit else None
+
+    results = [None] * len(clusters)
+    cache_keys = {}
+    jobs = []
+    for index, cluster in enumerate(clusters):
+        ids = [p_task['id'] for p_task in cluster]
+        cluster_frozen = {i: frozen[i] for i in ids if i in frozen}
+        cluster_hints = {i: hints[i] for i in ids if i in hints}
+
+        if cache is not None and not cluster_frozen:
+            key, origin, ordered_ids = cluster_key(cluster)
+            cached = cache.get(key, origin)
+            if cached is not None and (partial or not cached[1]):
+                results[index] = _cached_result(cluster, cached, origin, ordered_ids)
+                continue
+            if cached is not None:
+                # Entri dengan tugas tak terjadwal tidak berlaku untuk partial=False
+                cache.reject(key)
+            cache_keys[index] = (key, origin, ordered_ids)
+
+        jobs.append((index, (cluster, cluster_hints, cluster_frozen)))
+
+    cache_hits = len(clusters) - len(jobs)
+
+    solved_here = []
+    if engine != 'cpsat' and not on_solution:
+        # Kelompok yang sudah selesai oleh greedy tidak perlu dikirim ke process pool;
+        # hanya tugas yang benar-benar sampai ke CP-SAT yang menentukan perlu paralel atau tidak
+        pending = []
+        for index, job in jobs:
+            result, _ = _greedy_result(job[0], job[2], engine, _new_stats())
+            if result is None:
+                pending.append((index, job))
+            else:
+                solved_here.append((index, result))
+        jobs = pending
+
+    total_tasks = sum(len(job[0]) for _, job in jobs)
+    concurrent = len(jobs) > 1 and (on_solution or (parallel and total_tasks >= PARALLEL_MIN_TASKS))
+    if concurrent and num_workers is None:
+        # Kelompok sudah berjalan paralel, jangan biarkan tiap CP-SAT memakai semua core
+        num_workers = 1
+
+    solve_job = functools.partial(
+        solve_cluster, deadline=deadline, num_workers=num_workers, engine=engine, partial=partial)
+
+    if on_solution:
+        # Callback tidak bisa menyeberang proses, jadi mode streaming memakai thread
+        stream = _ScheduleStream(len(clusters), on_solution)
+        for index, r in enumerate(results):
+            if r is not None:
+                stream.update(index, r['assignments'], r['objective'], r['best_bound'])
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [
+                executor.submit(solve_job, *job, on_solution=functools.partial(stream.update, index))
+                for index, job in jobs
+            ]
+            solved = [f.result() for f in futures]
+    else:
+        solved = None
+        if concurrent and _use_process_pool:
+            pool = _get_cluster_pool()
+            try:
+                solved = list(pool.map(solve_job, *zip(*(job for _, job in jobs))))
+            except BrokenProcessPool:
+                # Request ini diteruskan di thread, request berikutnya memakai pool baru
+                _reset_cluster_pool(pool)
+        if solved is None and concurrent:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                solved = list(executor.map(solve_job, *zip(*(job for _, job in jobs))))
+        elif solved is None:
+            solved = [solve_job(*job) for _, job in jobs]
+
+    for index, r in solved_here + [(index, r) for (index, _), r in zip(jobs, solved)]:
+        results[index] = r
+        if index in cache_keys and r['status'] == 'OPTIMAL':
+            key, origin, ordered_ids = cache_keys[index]
+            cache.put(key, *_cache_entry(r, origin, ordered_ids))
+
+    stats = _new_stats()
+    for r in results:
+        _add_stats(stats, r['stats'])
+    stats['clusters'] = len(clusters)
+    stats['cache_hits'] = cache_hits
+
+    for r in results:
+        if r['assignments'] is None:
+            report = _make_report(r['status'])
+            report['stats'] = stats
+            return None, report, {}
+
+    assignments = {}
+    unscheduled = {}
+    for r in results:
+        assignments.update(r['assignments'])
+        unscheduled.update(r['unscheduled'])
+    status = 'OPTIMAL' if all(r['status'] == 'OPTIMAL' for r in results) else 'FEASIBLE'
+    report = _make_report(
+        status,
+        sum(r['objective'] for r in results),
+        sum(r['best_bound'] for r in results),
+    )
+    report['stats'] = stats
+    return assignments, report, unscheduled
+
+# Resolusi default (menit) untuk tugas di luar horizon pada mode rolling horizon
+BUCKET_MINUTES = 60
+
+def _coarse_task(p_task, bucket_minutes, bucket_offset=0):
+    # Window dibulatkan ke dalam dan durasi ke atas, sehingga jadwal dalam
+    # satuan bucket tetap valid saat dikembalikan ke menit
+    return {
+        'id': p_task['id'],
+        'name': p_task['name'],
+        'priority': p_task['priority'],
+        'duration_minutes': math.ceil(p_task['duration_minutes'] / bucket_minutes),
+        'window_start_minutes': math.ceil((p_task['window_start_minutes'] + bucket_offset) / bucket_minutes),
+        'window_end_minutes': math.floor((p_task['window_end_minutes'] + bucket_offset) / bucket_minutes),
+        'deadline_minutes': math.floor((p_task['deadline_minutes'] + bucket_offset) / bucket_minutes),
+    }
+
+def _coarse_blockers(occupied, bucket_minutes, bucket_offset=0):
+    # Gabungkan interval terisi (start, end, nama) dalam menit menjadi tugas
+    # semu berposisi tetap dalam satuan bucket
+    merged = []
+    for start, end, name in sorted(occupied):
+        start = (start + bucket_offset) // bucket_minutes
+        end = -(-(end + bucket_offset) // bucket_minutes)
+        if merged and start < merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+            merged[-1][2].append(name)
+        else:
+            merged.append([start, end, [name]])
+    return [{
+        'id': f'blocked-{index}',
+        'name': ', '.join(names),
+        'priority': 3,
+        'duration_minutes': end - start,
+        'window_start_minutes': start,
+        'window_end_minutes': end,
+        'deadline_minutes': end,
+        'fixed': True,
+    } for index, (start, end, names) in enumerate(merged)]
+
+def split_horizon(preprocessed_tasks, horizon_minutes, bucket_minutes=BUCKET_MINUTES, bucket_offset=0):
+    """Pisahkan tugas untuk mode rolling horizon menjadi (near, far).
+
+    Tugas yang window-nya baru terbuka setelah horizon masuk far dan nanti
+    dijadwalkan per bucket_minutes (lihat solve_far). Tugas yang tidak lagi
+    muat setelah dibulatkan ke bucket tetap dijadwalkan per menit.
+    """
+    near, far = [], []
+    for p_task in preprocessed_tasks:
+        if (int(p_task['window_start_minutes']) >= horizon_minutes
+                and static_conflict_reason(_coarse_task(p_task, bucket_minutes, bucket_offset)) is None):
+            far.append(p_task)
+        else:
+            near.append(p_task)
+    return near, far
+
+def solve_far(far_tasks, occupied, kept=None, bucket_minutes=BUCKET_MINUTES, bucket_offset=0, parallel=True,
+              time_limit=None, num_workers=None, engine='auto', cache=None, partial=True):
+    """Jadwalkan tugas di luar horizon dengan resolusi bucket_minutes.
+
+    Batas bucket jatuh di menit -bucket_offset (mod bucket_minutes) relatif
+    terhadap base_time. occupied adalah interval (start, end, nama) dalam menit yang sudah terisi
+    oleh tahap per menit. kept berisi posisi tersimpan tugas far
+    ({task_id: (start, end)}) yang dipertahankan tanpa di-solve ulang selama
+    tidak bertabrakan dengan occupied maupun sesamanya. Mengembalikan
+    (assignments, report, unscheduled) dalam menit seperti solve_clusters;
+    report['kept'] berisi jumlah tugas yang dipertahankan.
+    """
+    deadline = time.time() + time_limit if time_limit else None
+    kept = kept or {}
+    occupied = sorted(occupied)
+    occupied_starts = [start for start, _, _ in occupied]
+    # occupied tidak saling tumpang tindih, jadi end-nya ikut terurut
+    occupied_ends = [end for _, end, _ in occupied]
+
+    kept_assignments = {}
+    last_end = None
+    for p_task in sorted((t for t in far_tasks if t['id'] in kept), key=lambda t: kept[t['id']]):
+        start, end = kept[p_task['id']]
+        index = bisect.bisect_left(occupied_starts, end)
+        if index and occupied_ends[index - 1] > start:
+            continue
+        if last_end is not None and start < last_end:
+            continue
+        kept_assignments[p_task['id']] = (start, end)
+        last_end = end
+
+    occupied += [(*kept_assignments[p_task['id']], p_task['name']) for p_task in far_tasks if p_task['id'] in kept_assignments]
+    coarse_tasks = [_coarse_task(p_task, bucket_minutes, bucket_offset) for p_task in far_tasks if p_task['id'] not in kept_assignments]
+
+    if not coarse_tasks:
+        report = _make_report('OPTIMAL', 0.0, 0.0)
+        report['stats'] = _new_stats()
+        report['kept'] = len(kept_assignments)
+        return dict(kept_assignments), report, {}
+
+    first = min(p_task['window_start_minutes'] for p_task in coarse_tasks)
+    blockers = [b for b in _coarse_blockers(occupied, bucket_minutes, bucket_offset) if b['window_end_minutes'] > first]
+    frozen = {b['id']: (b['window_start_minutes'], b['window_end_minutes']) for b in blockers}
+    far_tasks_map = {p_task['id']: p_task for p_task in far_tasks}
+
+    clusters = []
+    tight_tasks = []
+    for cluster in split_clusters(coarse_tasks + blockers):
+        cluster_tasks = [p_task for p_task in cluster if not p_task.get('fixed')]
+        if not cluster_tasks:
+            continue
+        cluster_frozen = {i: frozen[i] for i in (p_task['id'] for p_task in cluster) if i in frozen}
+        if bucket_minutes > 1 and greedy_schedule(cluster, cluster_frozen) is None:
+            # Kelompok yang padat dijadwalkan per menit supaya tidak ada tugas yang tersingkir karena pembulatan
+            tight_tasks += [far_tasks_map[p_task['id']] for p_task in cluster_tasks]
+        else:
+            clusters.append(cluster)
+
+    assignments, report, unscheduled = solve_clusters(
+        clusters, None, frozen, parallel, time_limit, num_workers, None, engine, cache, partial)
+    report['kept'] = len(kept_assignments)
+    if assignments is None:
+        return None, report, {}
+
+    far_assignments = dict(kept_assignments)
+    for task_id, (start, _) in assignments.items():
+        if task_id in far_tasks_map:
+            start = start * bucket_minutes - bucket_offset
+            far_assignments[task_id] = (start, start + far_tasks_map[task_id]['duration_minutes'])
+    unscheduled = {i: r for i, r in unscheduled.items() if i in far_tasks_map}
+
+    if tight_tasks:
+        occupied += [
+            (*far_assignments[task_id], far_tasks_map[task_id]['name'])
+            for task_id in assignments if task_id in far_tasks_map
+        ]
+        tight_assignments, tight_report, tight_unscheduled = solve_far(
+            tight_tasks, occupied, None, 1, 0, parallel,
+            max(deadline - time.time(), 0.01) if deadline else None, num_workers, engine, cache, partial)
+        _add_stats(report['stats'], tight_report['stats'])
+        if tight_assignments is None:
+            report['status'] = tight_report['status']
+            return None, report, {}
+        far_assignments.update(tight_assignments)
+        unscheduled.update(tight_unscheduled)
+        if tight_report['status'] != 'OPTIMAL':
+            report['status'] = 'FEASIBLE'
+
+    return far_assignments, report, unscheduled
+
+def format_schedule(tasks, preprocessed_tasks, assignments, base_time, unscheduled=None, horizon_minutes=None):
+    # Tugas yang tidak ada di assignments ditandai konflik dengan alasan dari unscheduled.
+    # Dengan horizon_minutes, tugas terjadwal diberi 'firm' (mulai di dalam horizon) atau tidak (provisional)
+    unscheduled = unscheduled or {}
+    solved_tasks = []
+    conflict_tasks = []
+    for p_task in preprocessed_tasks:
+        name = p_task['name']
+        task_id = p_task['id']
+        if task_id not in assignments:
+            conflict_tasks.append({
                 'id': task_id,
                 'name': name,
-                'start_time': datetime.fromtimestamp(start_dt).isoformat(),
-                'end_time': datetime.fromtimestamp(end_dt).isoformat(),
-                'conflict': False,
+                'start_time': None,
+                'end_time': None,
+                'conflict': True,
+                'reason': unscheduled.get(task_id, 'Tidak bisa dijadwalkan.'),
             })
+            continue
+
+        start_time_minutes, end_time_minutes = assignments[task_id]
         
-        sorted_tasks = sorted(solved_tasks, key=lambda x: x['start_time'])
+        start_dt = (base_time.timestamp() + start_time_minutes * 60)
+        end_dt = (base_time.timestamp() + end_time_minutes * 60)
+
+        solved = {
+            'id': task_id,
+            'name': name,
+            'start_time': datetime.fromtimestamp(start_dt).isoformat(),
+            'end_time': datetime.fromtimestamp(end_dt).isoformat(),
+            'conflict': False,
+        }
+        if horizon_minutes is not None:
+            solved['firm'] = start_time_minutes < horizon_minutes
+        solved_tasks.append(solved)
+    
+    sorted_tasks = sorted(solved_tasks, key=lambda x: x['start_time'])
+    
+    original_tasks_map = {task['id']: task for task in tasks}
+    
+    final_result = []
+    for solved in sorted_tasks + conflict_tasks:
+        original = original_tasks_map[solved['id']]
+        row = {
+            'id': original['id'],
+            'name': original['name'],
+            'duration': original['duration'],
+            'priority': original.get('priority', '1'),
+            'deadline': original['deadline'],
+            'window_start': original['window_start'],
+            'window_end': original['window_end'],
+            'status': original['status'],
+            'start_time': solved['start_time'],
+            'end_time': solved['end_time'],
+            'conflict': solved['conflict']
+        }
+        if 'firm' in solved:
+            row['firm'] = solved['firm']
+        if solved['conflict']:
+            # 'reason' dibaca frontend, 'conflict_reason' disimpan controller ke database
+            row['reason'] = row['conflict_reason'] = solved['reason']
+        final_result.append(row)
         
-        original_tasks_map = {task['id']: task for task in tasks}
+    # Tambahkan kembali tugas yang tidak dijadwalkan
+    unsolved_tasks = [t for t in tasks if t.get('status') != 'Not Completed']
+    final_result.extend(unsolved_tasks)
         
-        final_result = []
-        for solved in sorted_tasks:
-            original = original_tasks_map[solved['id']]
-            final_result.append({
-                'id': original['id'],
-                'name': original['name'],
-                'duration': original['duration'],
-                'priority': original.get('priority', '1'),
-                'deadline': original['deadline'],
-                'window_start': original['window_start'],
-                'window_end': original['window_end'],
-                'status': original['status'],
-                'start_time': solved['start_time'],
-                'end_time': solved['end_time'],
-                'conflict': solved['conflict']
-            })
-            
-        # Tambahkan kembali tugas yang tidak dijadwalkan
-        unsolved_tasks = [t for t in tasks if t.get('status') != 'Not Completed']
-        final_result.extend(unsolved_tasks)
+    return final_result
+
+def _conflict_row(task, reason):
+    # Baris asli dengan penugasan dikosongkan, supaya controller tidak menimpa kolom lain dengan NULL
+    return {**task, 'start_time': None, 'end_time': None, 'conflict': True, 'reason': reason, 'conflict_reason': reason}
+
+def solve(tasks, incremental=False, changed_ids=None, parallel=True,
+          time_limit=None, num_workers=None, on_solution=None, engine='auto', cache=None,
+          partial=True, horizon_hours=None, bucket_minutes=BUCKET_MINUTES):
+    """Seperti solve_schedule, tetapi mengembalikan (schedule, report).
+
+    report berisi status akhir (OPTIMAL, FEASIBLE, INFEASIBLE, UNKNOWN atau
+    INVALID), nilai objective, best_bound dan gap relatif di antara keduanya.
+    time_limit (detik) membatasi seluruh request. Jika on_solution diberikan,
+    fungsi itu dipanggil dengan (schedule, report) setiap kali ditemukan
+    jadwal lengkap yang lebih baik. engine memilih 'auto', 'greedy' atau
+    'cpsat' (lihat solve_cluster). cache adalah ScheduleCache opsional.
+    Dengan partial=True, tugas yang tidak muat ditandai konflik satu per satu
+    beserta alasannya dan sisanya tetap dijadwalkan; report['unscheduled']
+    berisi jumlahnya. Dengan partial=False satu tugas yang mustahil membuat
+    semua tugas ditandai konflik. report['stats'] berisi waktu per fase
+    (build/solve dijumlahkan dari semua kelompok) dan statistik CP-SAT.
+    Dengan horizon_hours (rolling horizon), hanya tugas yang window-nya
+    terbuka dalam horizon_hours jam ke depan yang dijadwalkan per menit;
+    sisanya dijadwalkan per bucket_minutes di sela-selanya (dengan engine
+    'auto' cukup jadwal greedy, karena akan di-solve ulang saat masuk
+    horizon), dan dalam mode incremental posisi tersimpannya dipertahankan
+    selama masih valid.
+    Setiap tugas terjadwal diberi 'firm' True jika mulai di dalam horizon
+    dan False (provisional) jika tidak. objective dan gap hanya mencakup
+    tahap per menit; tahap bucket dilaporkan di report['horizon'].
+    """
+    if engine not in ENGINES:
+        raise ValueError(f'engine tidak dikenal: {engine}')
+
+    MINUTES_PER_HOUR = 60
+    # Dibulatkan ke menit supaya solve berulang menghasilkan waktu yang identik
+    base_time = datetime.now().replace(second=0, microsecond=0)
+    started = time.perf_counter()
+    
+    preprocessed_tasks = []
+    for task in tasks:
+        try:
+            # Skip tasks that are not to be scheduled
+            if task.get('status') != 'Not Completed':
+                continue
+                
+            deadline_dt = parse_time(task['deadline'])
+            window_start_dt = parse_time(task['window_start'])
+            window_end_dt = parse_time(task['window_end'])
             
-        return final_result
+            preprocessed_tasks.append({
+                'id': task['id'],
+                'name': task['name'],
+                'duration_minutes': int(float(task['duration']) * MINUTES_PER_HOUR),
+                'priority': int(task.get('priority', '1')),  # Default to lowest priority if not set
+                'deadline_minutes': (deadline_dt - base_time).total_seconds() / 60,
+                'window_start_minutes': (window_start_dt - base_time).total_seconds() / 60,
+                'window_end_minutes': (window_end_dt - base_time).total_seconds() / 60,
+            })
+        except (ValueError, KeyError) as e:
+            return [_conflict_row({'name': 'Unknown Task', **task}, 'Data tugas tidak valid.')], _make_report('INVALID')
+
+    static_conflicts = {}
+    for p_task in preprocessed_tasks:
+        reason = static_conflict_reason(p_task)
+        if reason is None:
+            continue
+        if not partial:
+            if reason == 'Durasi atau window tidak valid.':
+                original = next(task for task in tasks if task.get('id') == p_task['id'])
+                return [_conflict_row(original, reason)], _make_report('INVALID')
+            continue
+        static_conflicts[p_task['id']] = reason
+
+    schedulable_tasks = [p_task for p_task in preprocessed_tasks if p_task['id'] not in static_conflicts]
+
+    horizon_minutes = None
+    near_tasks, far_tasks = schedulable_tasks, []
+    if horizon_hours is not None:
+        horizon_minutes = horizon_hours * MINUTES_PER_HOUR
+        # Bucket disejajarkan dengan jam dinding (dihitung dari tengah malam), bukan dengan base_time
+        bucket_offset = (base_time.hour * MINUTES_PER_HOUR + base_time.minute) % bucket_minutes
+        near_tasks, far_tasks = split_horizon(schedulable_tasks, horizon_minutes, bucket_minutes, bucket_offset)
+    far_ids = {p_task['id'] for p_task in far_tasks}
+
+    hints, frozen = {}, {}
+    if incremental:
+        hints, frozen = plan_incremental(schedulable_tasks, tasks, base_time, changed_ids, lazy_ids=far_ids)
+
+    cluster_callback = None
+    if on_solution:
+        # Jadwal sementara hanya berisi tahap per menit; tugas far baru muncul di hasil akhir
+        streamed_tasks = [p_task for p_task in preprocessed_tasks if p_task['id'] not in far_ids]
+
+        def cluster_callback(assignments, objective, best_bound):
+            schedule = format_schedule(tasks, streamed_tasks, assignments, base_time, static_conflicts, horizon_minutes)
+            on_solution(schedule, _make_report('FEASIBLE', objective, best_bound))
+
+    clusters = split_clusters(near_tasks)
+    preprocess_seconds = time.perf_counter() - started
+    request_deadline = time.time() + time_limit if time_limit else None
+
+    assignments, report, unscheduled = solve_clusters(
+        clusters, hints, frozen, parallel, time_limit, num_workers, cluster_callback, engine, cache, partial)
+
+    if far_tasks and assignments is not None:
+        names = {p_task['id']: p_task['name'] for p_task in near_tasks}
+        occupied = [(start, end, names[task_id]) for task_id, (start, end) in assignments.items()]
+        far_assignments, far_report, far_unscheduled = solve_far(
+            far_tasks, occupied, {i: frozen[i] for i in far_ids if i in frozen}, bucket_minutes, bucket_offset, parallel,
+            max(request_deadline - time.time(), 0.01) if request_deadline else None,
+            num_workers, 'greedy' if engine == 'auto' else engine, cache, partial)
+        _add_stats(report['stats'], far_report.pop('stats'))
+        report['horizon'] = far_report
+        if far_assignments is None:
+            assignments = None
+            report['status'] = far_report['status']
+        else:
+            assignments.update(far_assignments)
+            unscheduled.update(far_unscheduled)
+            if far_report['status'] != 'OPTIMAL' and report['status'] == 'OPTIMAL':
+                report['status'] = 'FEASIBLE'
+
+    started = time.perf_counter()
+    if assignments is not None:
+        unscheduled.update(static_conflicts)
+        report['unscheduled'] = len(unscheduled)
+        if horizon_minutes is not None:
+            report.setdefault('horizon', {})
+            report['horizon']['firm'] = sum(1 for start, _ in assignments.values() if start < horizon_minutes)
+            report['horizon']['provisional'] = len(assignments) - report['horizon']['firm']
+        schedule = format_schedule(tasks, preprocessed_tasks, assignments, base_time, unscheduled, horizon_minutes)
     else:
-        conflicts = [{'id': t['id'], 'name': t['name'], 'conflict': True, 'reason': 'Tidak bisa dijadwalkan.'} for t in tasks]
-        return conflicts
+        schedule = [
+            _conflict_row(task, 'Tidak bisa dijadwalkan.') if task.get('status') == 'Not Completed' else task
+            for task in tasks
+        ]
+
+    report['stats']['preprocess_seconds'] = preprocess_seconds
+    report['stats']['format_seconds'] = time.perf_counter() - started
+    return schedule, report
+
+def solve_schedule(tasks, **options):
+    return solve(tasks, **options)[0]
+
+def _normalize_time(value):
+    if not value:
+        return None
+    try:
+        return parse_time(value)
+    except ValueError:
+        return value
+
+def _assignment_changed(original, row):
+    if _normalize_time(original.get('start_time')) != _normalize_time(row.get('start_time')):
+        return True
+    if _normalize_time(original.get('end_time')) != _normalize_time(row.get('end_time')):
+        return True
+    if bool(original.get('conflict')) != bool(row.get('conflict')):
+        return True
+    return bool(row.get('conflict')) and original.get('conflict_reason') != row.get('conflict_reason')
+
+def diff_schedule(tasks, schedule):
+    """Ambil hanya baris jadwal yang penugasannya berbeda dari input.
+
+    Dibandingkan dengan start_time, end_time, conflict dan conflict_reason
+    yang sudah ada di baris input, sehingga pemanggil cukup menulis baris
+    yang berubah. Mengembalikan (changed_rows, summary).
+    """
+    original_tasks_map = {task.get('id'): task for task in tasks}
+    changed = [
+        row for row in schedule
+        if row.get('id') not in original_tasks_map or _assignment_changed(original_tasks_map[row.get('id')], row)
+    ]
+    summary = {
+        'total': len(schedule),
+        'changed': len(changed),
+        'unchanged': len(schedule) - len(changed),
+        'conflicts': sum(1 for row in schedule if row.get('conflict')),
+    }
+    return changed, summary
+
+def peak_memory_kb():
+    # Puncak RSS proses ini; --instrument dijalankan sekali jalan, yang tidak memakai
+    # process pool (lihat use_process_pool). Modul resource tidak tersedia di Windows
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def instrumentation_record(report, task_count, parse_seconds, serialize_seconds):
+    # Satu baris JSON untuk --instrument; format yang sama dibaca benchmark.py
+    stats = report.get('stats', {})
+    return {
+        'event': 'instrumentation',
+        'tasks': task_count,
+        'status': report['status'],
+        'objective': report.get('objective'),
+        'gap': report.get('gap'),
+        'unscheduled': report.get('unscheduled', 0),
+        'timings': {
+            'parse': parse_seconds,
+            'preprocess': stats.get('preprocess_seconds', 0.0),
+            'greedy': stats.get('greedy_seconds', 0.0),
+            'build': stats.get('build_seconds', 0.0),
+            'solve': stats.get('solve_seconds', 0.0),
+            'format': stats.get('format_seconds', 0.0),
+            'serialize': serialize_seconds,
+        },
+        'cpsat': {
+            'calls': stats.get('cpsat_calls', 0),
+            'num_conflicts': stats.get('num_conflicts', 0),
+            'num_branches': stats.get('num_branches', 0),
+        },
+        'clusters': stats.get('clusters', 0),
+        'cache_hits': stats.get('cache_hits', 0),
+        'peak_memory_kb': peak_memory_kb(),
+    }
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Solveria schedule solver')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Pakai start_time/end_time tersimpan sebagai hint dan bekukan tugas yang tidak terdampak')
+    parser.add_argument('--changed', action='append', type=int, default=[], metavar='ID',
+                        help='ID tugas yang berubah (bisa diulang)')
+    parser.add_argument('--no-parallel', dest='parallel', action='store_false',
+                        help='Selesaikan kelompok tugas secara berurutan dalam satu proses')
+    parser.add_argument('--time-limit', type=float, default=None, metavar='SECONDS',
+                        help='Batas waktu solve; jadwal terbaik yang ditemukan dikembalikan saat waktu habis')
+    parser.add_argument('--num-workers', type=int, default=None,
+                        help='Jumlah search worker CP-SAT')
+    parser.add_argument('--engine', choices=ENGINES, default='auto',
+                        help='greedy, cpsat, atau auto (greedy lalu CP-SAT bila belum terbukti optimal)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='Direktori cache hasil solve yang dipakai bersama antar pemanggilan')
+    parser.add_argument('--no-partial', dest='partial', action='store_false',
+                        help='Tandai semua tugas konflik jika ada satu tugas yang tidak muat (perilaku lama)')
+    parser.add_argument('--horizon-hours', type=float, default=None, metavar='HOURS',
+                        help='Rolling horizon: jadwalkan per menit hanya tugas yang window-nya terbuka dalam HOURS jam')
+    parser.add_argument('--bucket-minutes', type=int, default=BUCKET_MINUTES,
+                        help='Resolusi (menit) untuk tugas di luar horizon')
+    parser.add_argument('--stream', action='store_true',
+                        help='Tulis setiap jadwal yang membaik sebagai baris NDJSON, diakhiri baris "final"')
+    parser.add_argument('--diff', action='store_true',
+                        help='Keluarkan hanya tugas yang penugasannya berubah dari input, beserta ringkasan')
+    parser.add_argument('--instrument', action='store_true',
+                        help='Tulis waktu per fase dan statistik CP-SAT sebagai JSON ke stderr')
+    args = parser.parse_args()
+
     tasks_json = sys.stdin.read()
     
     if not tasks_json:
@@ -131,10 +1215,47 @@ if __name__ == '__main__':
         sys.exit()
 
     try:
+        started = time.perf_counter()
         tasks_data = json.loads(tasks_json)
-        solved_schedule = solve_schedule(tasks_data)
-        
-        print(json.dumps(solved_schedule))
+        parse_seconds = time.perf_counter() - started
+
+        options = {
+            'incremental': args.incremental,
+            'changed_ids': args.changed,
+            'parallel': args.parallel,
+            'time_limit': args.time_limit,
+            'num_workers': args.num_workers,
+            'engine': args.engine,
+            'cache': ScheduleCache(directory=args.cache_dir) if args.cache_dir else None,
+            'partial': args.partial,
+            'horizon_hours': args.horizon_hours,
+            'bucket_minutes': args.bucket_minutes,
+        }
+
+        def render(schedule):
+            if not args.diff:
+                return {'schedule': schedule}
+            changed, summary = diff_schedule(tasks_data, schedule)
+            return {'changed': changed, 'summary': summary}
+
+        if args.stream:
+            def print_solution(schedule, report):
+                print(json.dumps({'event': 'solution', 'report': report, **render(schedule)}), flush=True)
+
+            solved_schedule, report = solve(tasks_data, on_solution=print_solution, **options)
+            started = time.perf_counter()
+            output = json.dumps({'event': 'final', 'report': report, **render(solved_schedule)})
+        else:
+            solved_schedule, report = solve(tasks_data, **options)
+            started = time.perf_counter()
+            rendered = render(solved_schedule)
+            output = json.dumps(rendered if args.diff else solved_schedule)
+        serialize_seconds = time.perf_counter() - started
+
+        print(output)
+        if args.instrument:
+            record = instrumentation_record(report, len(tasks_data), parse_seconds, serialize_seconds)
+            print(json.dumps(record), file=sys.stderr)
 
     except json.JSONDecodeError as e:
         print(json.dumps([{'name': 'Unknown Task', 'conflict': True, 'reason': f'Input JSON tidak valid: {e}'}]))
@@ -0,0 +1,105 @@
+// backend/src/solver/solverClient.js
+const { spawn } = require('child_process');
+const readline = require('readline');
+
+// Satu proses solver daemon (src/solver/server.py) dipakai bersama oleh semua
+// request, sehingga startup Python dan import ortools hanya terjadi sekali.
+let daemon = null;
+let nextId = 1;
+const pending = new Map();
+
+// Batas tunggu per request: time_limit solver ditambah kelonggaran untuk parse, format
+// dan antrean di daemon; tanpa time_limit dipakai batas default.
+const DEFAULT_SOLVE_TIMEOUT_MS = 60 * 1000;
+const SOLVE_TIMEOUT_MARGIN_MS = 10 * 1000;
+
+const settle = (id) => {
+    const entry = pending.get(id);
+    if (!entry) return null;
+    clearTimeout(entry.timer);
+    pending.delete(id);
+    return entry;
+};
+
+const failPending = (error) => {
+    for (const id of [...pending.keys()]) {
+        settle(id).reject(error);
+    }
+};
+
+const startDaemon = () => {
+    const python = spawn('python', ['src/solver/server.py']);
+
+    readline.createInterface({ input: python.stdout }).on('line', (line) => {
+        let response;
+        try {
+            response = JSON.parse(line);
+        } catch (e) {
+            console.error('Invalid response from solver daemon:', line);
+            return;
+        }
+
+        const entry = pending.get(response.id);
+        if (!entry) return;
+
+        if (response.event === 'solution') {
+            if (entry.onSolution) entry.onSolution(response.schedule, response.report);
+            return;
+        }
+        settle(response.id);
+
+        if (response.error) {
+            entry.reject(new Error(response.error));
+        } else {
+            const { result, changed, summary, report } = response;
+            entry.resolve({ result, changed, summary, report });
+        }
+    });
+
+    python.stderr.on('data', (data) => {
+        console.error(`Solver daemon: ${data.toString()}`);
+    });
+
+    python.on('close', (code) => {
+        console.error(`Solver daemon exited with code ${code}`);
+        if (daemon === python) daemon = null;
+        failPending(new Error('Solver daemon exited.'));
+    });
+
+    python.stdin.on('error', (err) => {
+        console.error('Failed to write to solver daemon:', err);
+        failPending(new Error('Failed to write to solver daemon.'));
+    });
+
+    python.on('error', (err) => {
+        console.error('Failed to start solver daemon:', err);
+        if (daemon === python) daemon = null;
+        failPending(new Error('Failed to start solver daemon.'));
+    });
+
+    return python;
+};
+
+// Kirim daftar tugas ke daemon, hasilnya berupa Promise { result, changed, summary, report }.
+// result adalah jadwal lengkap; dengan options.diff, changed hanya berisi tugas yang penugasannya
+// berubah dan summary berisi ringkasannya.
+// Jika onSolution diberikan, fungsi itu dipanggil untuk setiap jadwal sementara yang membaik.
+// Promise ditolak jika daemon tidak menjawab dalam batas tunggu, gagal ditulisi, atau berhenti.
+const solve = (tasks, options = {}, onSolution = null) => {
+    if (!daemon) daemon = startDaemon();
+
+    const id = nextId++;
+    const request = { id, tasks, options: onSolution ? { ...options, stream: true } : options };
+    const timeoutMs = options.time_limit
+        ? options.time_limit * 1000 + SOLVE_TIMEOUT_MARGIN_MS
+        : DEFAULT_SOLVE_TIMEOUT_MS;
+    return new Promise((resolve, reject) => {
+        const timer = setTimeout(() => {
+            if (settle(id)) reject(new Error('Solver daemon did not respond in time.'));
+        }, timeoutMs);
+        pending.set(id, { resolve, reject, onSolution, timer });
+        daemon.stdin.write(JSON.stringify(request) + '\n');
+    });
+};
+
+module.exports = { solve };
@@ -0,0 +1,88 @@
+# backend/tests/test_cache.py
+#
+# Jalankan dari folder backend: python -m pytest -q tests
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'solver'))
+
+from solver import solve, solve_clusters  # noqa: E402
+from cache import ScheduleCache  # noqa: E402
+
+
+def _tasks(window_offset_minutes):
+    # A mendesak tetapi prioritas rendah, B prioritas tinggi dengan deadline longgar
+    window_start = datetime.now().replace(second=0, microsecond=0) + timedelta(minutes=window_offset_minutes)
+    window_end = window_start + timedelta(minutes=1000)
+    return [
+        {
+            'id': 1, 'name': 'A', 'duration': '1', 'priority': '1', 'status': 'Not Completed',
+            'deadline': (window_start + timedelta(minutes=200)).isoformat(),
+            'window_start': window_start.isoformat(), 'window_end': window_end.isoformat(),
+        },
+        {
+            'id': 2, 'name': 'B', 'duration': '1', 'priority': '3', 'status': 'Not Completed',
+            'deadline': window_end.isoformat(),
+            'window_start': window_start.isoformat(), 'window_end': window_end.isoformat(),
+        },
+    ]
+
+
+def _order(schedule):
+    return [row['name'] for row in schedule]
+
+
+def _overfull_cluster():
+    # Tiga tugas 60 menit dalam window 120 menit: satu harus dilepas lewat jalur partial (CP-SAT)
+    return [
+        {
+            'id': task_id, 'name': name, 'duration_minutes': 60, 'priority': priority,
+            'deadline_minutes': 120, 'window_start_minutes': 0, 'window_end_minutes': 120,
+        }
+        for task_id, name, priority in ((1, 'A', 1), (2, 'B', 3), (3, 'C', 2))
+    ]
+
+
+def test_cached_order_is_not_reused_after_deadlines_move_closer():
+    cache = ScheduleCache()
+    schedule, _ = solve(_tasks(300), parallel=False, cache=cache)
+    assert _order(schedule) == ['B', 'A']
+
+    # Window relatif sama, tetapi deadline makin dekat sehingga bobotnya berubah
+    schedule, report = solve(_tasks(0), parallel=False, cache=cache)
+    fresh, fresh_report = solve(_tasks(0), parallel=False)
+
+    assert _order(schedule) == _order(fresh) == ['A', 'B']
+    assert report['objective'] == pytest.approx(fresh_report['objective'])
+    assert report['stats']['cache_hits'] == 0
+
+
+def test_identical_cluster_is_served_as_stored():
+    cache = ScheduleCache()
+    first, first_report, first_unscheduled = solve_clusters([_overfull_cluster()], parallel=False, cache=cache)
+    assert first_report['stats']['cpsat_calls'] > 0
+    assert list(first_unscheduled) == [1]
+
+    second, report, unscheduled = solve_clusters([_overfull_cluster()], parallel=False, cache=cache)
+
+    assert report['stats']['cache_hits'] == 1
+    assert report['stats']['cpsat_calls'] == 0
+    assert report['status'] == 'OPTIMAL'
+    assert second == first
+    assert unscheduled == first_unscheduled
+    assert cache.stats()['hits'] == 1
+
+
+def test_partial_entry_is_not_counted_as_hit_without_partial():
+    cache = ScheduleCache()
+    solve_clusters([_overfull_cluster()], parallel=False, cache=cache)
+
+    assignments, report, _ = solve_clusters([_overfull_cluster()], parallel=False, cache=cache, partial=False)
+
+    assert assignments is None
+    assert report['stats']['cache_hits'] == 0
+    assert cache.stats()['hits'] == 0
+    assert cache.stats()['stale'] == 1
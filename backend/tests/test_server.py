@@ -0,0 +1,49 @@
+# backend/tests/test_server.py
+#
+# Jalankan dari folder backend: python -m pytest -q tests
+import os
+import sys
+import json
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'solver'))
+
+from server import handle_line  # noqa: E402
+
+
+def _task(task_id, name, window_start, hours, **extra):
+    window_end = window_start + timedelta(hours=hours)
+    return {
+        'id': task_id, 'name': name, 'duration': '1', 'priority': '2', 'status': 'Not Completed',
+        'deadline': window_end.isoformat(), 'window_start': window_start.isoformat(),
+        'window_end': window_end.isoformat(), 'start_time': None, 'end_time': None, 'conflict': 0, **extra,
+    }
+
+
+def _handle(request):
+    return handle_line(json.dumps(request), lambda response: None)
+
+
+def test_diff_response_keeps_full_schedule():
+    start = datetime.now().replace(second=0, microsecond=0) + timedelta(hours=1)
+    tasks = [_task(1, 'A', start, 1), _task(2, 'B', start, 1), _task(3, 'C', start + timedelta(hours=5), 2)]
+    first = _handle({'id': 1, 'tasks': tasks})['result']
+
+    # Simpan hasil pertama seperti controller, lalu ubah hanya C
+    stored = {row['id']: row for row in first}
+    tasks = [{**task, **{key: stored[task['id']].get(key) for key in ('start_time', 'end_time', 'conflict')},
+              'conflict_reason': stored[task['id']].get('conflict_reason')} for task in tasks]
+    tasks[2]['window_start'] = (start + timedelta(hours=6)).isoformat()
+
+    response = _handle({'id': 2, 'tasks': tasks, 'options': {'diff': True, 'incremental': True, 'changed_ids': [3]}})
+
+    assert [row['id'] for row in response['changed']] == [3]
+    assert response['summary']['total'] == len(response['result']) == 3
+    conflicts = [row for row in response['result'] if row['conflict']]
+    assert conflicts and all(row['reason'] for row in conflicts)
+    scheduled = [row['start_time'] for row in response['result'] if not row['conflict']]
+    assert scheduled == sorted(scheduled)
+
+
+def test_invalid_request_echoes_id():
+    assert _handle({'id': 9}) == {'id': 9, 'error': 'Request harus berisi "tasks" berupa list.'}
@@ -0,0 +1,142 @@
+# backend/tests/test_solver.py
+#
+# Jalankan dari folder backend: python -m pytest -q tests
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'solver'))
+
+from solver import solve, plan_incremental, diff_schedule  # noqa: E402
+
+BASE_TIME = datetime(2026, 1, 5, 8, 0)
+
+
+def _at(minutes):
+    return BASE_TIME + timedelta(minutes=minutes)
+
+
+def _utc(dt):
+    # Bentuk yang dikirim mysql2 untuk kolom DATETIME: UTC dengan akhiran Z
+    return dt.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def _task(task_id, name, window_start, window_end, deadline=None, duration='1', priority='2', **extra):
+    return {
+        'id': task_id, 'name': name, 'duration': duration, 'priority': priority, 'status': 'Not Completed',
+        'deadline': (deadline or window_end).isoformat(),
+        'window_start': window_start.isoformat(), 'window_end': window_end.isoformat(),
+        'start_time': None, 'end_time': None, 'conflict': 0, **extra,
+    }
+
+
+def _preprocessed(task_id, window_start, window_end, duration=60):
+    return {
+        'id': task_id, 'name': f'T{task_id}', 'duration_minutes': duration, 'priority': 2,
+        'deadline_minutes': window_end, 'window_start_minutes': window_start, 'window_end_minutes': window_end,
+    }
+
+
+def test_plan_incremental_reads_utc_stored_times():
+    tasks = [
+        _task(1, 'T1', _at(0), _at(300), start_time=_utc(_at(60)), end_time=_utc(_at(120))),
+        _task(2, 'T2', _at(0), _at(300), start_time=_utc(_at(180)), end_time=_utc(_at(240))),
+        _task(3, 'T3', _at(600), _at(900)),
+    ]
+    preprocessed = [_preprocessed(1, 0, 300), _preprocessed(2, 0, 300), _preprocessed(3, 600, 900)]
+
+    hints, frozen = plan_incremental(preprocessed, tasks, BASE_TIME, changed_ids=[3])
+
+    assert hints == {1: (60, 120), 2: (180, 240)}
+    assert frozen == {1: (60, 120), 2: (180, 240)}
+
+
+def test_diff_schedule_lists_only_changed_assignments():
+    tasks = [
+        _task(1, 'T1', _at(0), _at(300), start_time=_utc(_at(60)), end_time=_utc(_at(120))),
+        _task(2, 'T2', _at(0), _at(300), start_time=_at(120).isoformat(), end_time=_at(180).isoformat()),
+        _task(3, 'T3', _at(0), _at(300), conflict=1, conflict_reason='Tidak bisa dijadwalkan.'),
+    ]
+    schedule = [
+        # Waktu yang sama, hanya beda format (UTC dari database vs waktu lokal dari solver)
+        {**tasks[0], 'start_time': _at(60).isoformat(), 'end_time': _at(120).isoformat(), 'conflict': False},
+        {**tasks[1], 'start_time': _at(180).isoformat(), 'end_time': _at(240).isoformat(), 'conflict': False},
+        {**tasks[2], 'conflict': True, 'conflict_reason': 'Bertabrakan dengan tugas: T1.'},
+    ]
+
+    changed, summary = diff_schedule(tasks, schedule)
+
+    assert [row['id'] for row in changed] == [2, 3]
+    assert summary == {'total': 3, 'changed': 2, 'unchanged': 1, 'conflicts': 1}
+
+
+def test_rolling_horizon_schedule_is_valid():
+    now = datetime.now().replace(second=0, microsecond=0)
+    tasks = [
+        _task(i, f'T{i}', now + timedelta(hours=offset), now + timedelta(hours=offset + 8),
+              duration=duration, priority=str(i % 3 + 1))
+        for i, (offset, duration) in enumerate(
+            [(2, '2'), (3, '1.5'), (4, '3'), (50, '2'), (50, '1.25'), (52, '4'), (75, '0.5'), (76, '2')], start=1)
+    ]
+
+    schedule, report = solve(tasks, parallel=False, horizon_hours=24)
+
+    assert report['unscheduled'] == 0
+    rows = sorted(schedule, key=lambda row: row['start_time'])
+    by_id = {task['id']: task for task in tasks}
+    for row in rows:
+        start, end = datetime.fromisoformat(row['start_time']), datetime.fromisoformat(row['end_time'])
+        task = by_id[row['id']]
+        assert not row['conflict']
+        assert end - start == timedelta(hours=float(task['duration']))
+        assert datetime.fromisoformat(task['window_start']) <= start
+        assert end <= datetime.fromisoformat(task['window_end'])
+        # Tugas yang jauh dari batas horizon, jadi tidak bergantung pada menit saat test berjalan
+        assert row['firm'] == (row['id'] <= 3)
+        if not row['firm']:
+            assert start.minute == 0
+    for previous, row in zip(rows, rows[1:]):
+        assert previous['end_time'] <= row['start_time']
+
+
+def test_partial_conflict_names_the_blocking_tasks():
+    start = datetime.now().replace(second=0, microsecond=0) + timedelta(hours=1)
+    tasks = [
+        _task(1, 'A', start, start + timedelta(hours=2), priority='1'),
+        _task(2, 'B', start, start + timedelta(hours=2), priority='3'),
+        _task(3, 'C', start, start + timedelta(hours=2), priority='2'),
+        {**_task(4, 'D', start, start + timedelta(hours=2)), 'status': 'Completed'},
+    ]
+
+    schedule, report = solve(tasks, parallel=False)
+
+    by_id = {row['id']: row for row in schedule}
+    assert report['unscheduled'] == 1
+    assert by_id[1]['conflict']
+    assert by_id[1]['reason'] == 'Bertabrakan dengan tugas: B, C.'
+    assert not by_id[2]['conflict'] and not by_id[3]['conflict']
+    assert by_id[2]['start_time'] is not None and by_id[3]['start_time'] is not None
+    # Tugas yang tidak dijadwalkan dikembalikan apa adanya
+    assert by_id[4] == tasks[3]
+
+
+def test_failed_solve_keeps_original_rows():
+    start = datetime.now().replace(second=0, microsecond=0) + timedelta(hours=1)
+    tasks = [
+        _task(1, 'A', start, start + timedelta(hours=2)),
+        _task(2, 'B', start, start + timedelta(hours=2)),
+        _task(3, 'C', start, start + timedelta(hours=2)),
+        {**_task(4, 'D', start, start + timedelta(hours=2)), 'status': 'Completed'},
+    ]
+
+    schedule, report = solve(tasks, parallel=False, partial=False)
+
+    by_id = {row['id']: row for row in schedule}
+    assert report['status'] == 'INFEASIBLE'
+    assert by_id[4] == tasks[3]
+    for task in tasks[:3]:
+        row = by_id[task['id']]
+        assert row['conflict'] and row['start_time'] is None
+        assert row['conflict_reason'] == row['reason']
+        assert {key: row[key] for key in ('name', 'duration', 'deadline', 'status')} == \
+            {key: task[key] for key in ('name', 'duration', 'deadline', 'status')}